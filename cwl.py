@@ -1,6 +1,5 @@
-import urllib.request
-from bs4 import BeautifulSoup
 import sys
+from price_quotes import yahoo_quote
 
 # read in list of stocks to check and
 # the corresponding threshold prices
@@ -32,13 +31,12 @@ output = ''
 
 # scrape stock prices and set output to alert message
 # if some of them are below the given prices
+# (quote_source can be set before this script is executed to use a
+# different source of prices, cf. price_quotes.py)
+quote_source = globals().get('quote_source', yahoo_quote)
 for s in stocks.keys():
-    source = "https://finance.yahoo.com/quote/" + s
-    filehandle = urllib.request.urlopen(source)
-    soup = BeautifulSoup(filehandle.read(), "html.parser")
-    priceSpan = soup.findAll("span", {"class": "Fz(36px)"})
-    for elt in priceSpan:
-        curr = float(elt.getText())
+    curr = quote_source(s)
+    if curr is not None:
         comp = stocks[s]
         if curr <= comp:
             alert = True
@@ -0,0 +1,211 @@
+# Price quotes for the trading account logbook
+#
+# A quote source is any callable that takes a Yahoo Finance handle and
+# returns the current price as a float (or None if no price was found).
+# yahoo_quote scans the quote page as it is downloaded and stops as soon as
+# the price element has been read; the full BeautifulSoup parse is only used
+# as a fallback. yahoo_json_quote and stub_quote can be swapped in wherever
+# a quote source is accepted (get_update_dict, check_watchlist).
+
+
+# 0: packages
+import urllib.request
+import json
+import io
+import os
+import re
+import time
+
+
+# 1: extractors that find the price in a Yahoo Finance quote page
+def scan_price(stream, fallback=None):
+    '''Return the price from a quote page by scanning it chunk by chunk.
+
+    Arguments:
+    stream -- file-like object with a read method returning bytes
+                    (e.g. the response of urllib.request.urlopen)
+
+    Optional arguments:
+    fallback -- callable that is given the full page if the price element was
+                    not found by the scan (e.g. soup_price), default None
+
+    Note:
+    Reading stops right after the first price element, so the rest of the
+    page is neither downloaded nor parsed. If the price element is missing or
+    its text is not a number, the fallback is used. Returns None if no price
+    was found.
+    '''
+    seen = []
+    tail = b''
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        if fallback is not None:
+            seen.append(chunk)
+        buf = tail + chunk
+        match = price_span.search(buf)
+        if match:
+            price = to_price(match.group(1))
+            if price is not None or fallback is None:
+                return price
+            seen.append(stream.read())
+            break
+        tail = buf[-scan_overlap:]
+    if fallback is not None:
+        return fallback(b''.join(seen))
+    return None
+
+
+def soup_price(page):
+    '''Return the price from a quote page by parsing it with BeautifulSoup
+    (the first price element is used, as in scan_price).
+
+    Arguments:
+    page -- content of the quote page (bytes or string)
+    '''
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(page, "html.parser")
+    elt = soup.find("span", {"class": price_class})
+    if elt is None:
+        return None
+    return to_price(elt.getText())
+
+
+def to_price(text):
+    if isinstance(text, bytes):
+        text = text.decode('utf-8', 'ignore')
+    try:
+        return float(text.strip().replace(',', ''))
+    except ValueError:
+        return None
+
+
+# 2: quote sources
+def yahoo_quote(handle):
+    '''Return the current price of a stock scraped from Yahoo Finance.
+
+    Arguments:
+    handle -- Yahoo Finance handle of the stock
+    '''
+    filehandle = urllib.request.urlopen(yf_url + handle)
+    try:
+        return scan_price(filehandle, fallback=soup_price)
+    finally:
+        filehandle.close()
+
+
+def yahoo_json_quote(handle):
+    '''Return the current price of a stock from the Yahoo Finance JSON quote
+    endpoint (no HTML is parsed at all).
+
+    Arguments:
+    handle -- Yahoo Finance handle of the stock
+    '''
+    filehandle = urllib.request.urlopen(yf_json_url + handle)
+    try:
+        d = json.loads(filehandle.read().decode('utf-8'))
+    finally:
+        filehandle.close()
+    result = d['quoteResponse']['result']
+    if not result or 'regularMarketPrice' not in result[0].keys():
+        return None
+    return float(result[0]['regularMarketPrice'])
+
+
+def stub_quote(prices):
+    '''Return a quote source that looks prices up locally (no network).
+
+    Arguments:
+    prices -- dictionary of prices with the Yahoo Finance handles as keys,
+                    or name of a file with lines of the form
+                    "<handle> <price>" (same format as watchlist.txt)
+    '''
+    if isinstance(prices, str):
+        prices_file = open(prices, 'r')
+        d = {}
+        for line in prices_file:
+            if line.strip():
+                temp = line.strip().split(' ')
+                d[temp[0]] = float(temp[1])
+        prices_file.close()
+        prices = d
+
+    def quote(handle):
+        return prices.get(handle)
+    return quote
+
+
+# 3: fixtures and benchmark
+def save_quote_page(handle, folder='./quote_fixtures'):
+    '''Download a Yahoo Finance quote page and save it as an HTML fixture.
+
+    Arguments:
+    handle -- Yahoo Finance handle of the stock
+
+    Optional arguments:
+    folder -- folder in which the page is saved as <handle>.html
+    '''
+    if not os.path.isdir(folder):
+        os.mkdir(folder)
+        print('Created folder for quote fixtures.')
+    filehandle = urllib.request.urlopen(yf_url + handle)
+    page = filehandle.read()
+    filehandle.close()
+    page_file = open(os.path.join(folder, handle + '.html'), 'wb')
+    page_file.write(page)
+    page_file.close()
+
+
+def benchmark_extractors(folder='./quote_fixtures', repeat=20):
+    '''Compare the scanning extractor with the full BeautifulSoup parse on
+    saved quote pages (cf. save_quote_page).
+
+    Optional arguments:
+    folder -- folder containing the saved quote pages (*.html)
+    repeat -- number of times each page is processed by each extractor
+
+    Note:
+    Raise AssertionError if the two extractors give different prices for a
+    page. Return a dictionary with the file names as keys and tuples of the
+    form (scan time, soup time, scanned price, parsed price) as values, where
+    the times are averages in milliseconds.
+    '''
+    results = {}
+    if not os.path.isdir(folder):
+        print('Folder <' + folder + '> not found, no benchmark run.')
+        return results
+    for fname in sorted(os.listdir(folder)):
+        if not fname.endswith('.html'):
+            continue
+        page_file = open(os.path.join(folder, fname), 'rb')
+        page = page_file.read()
+        page_file.close()
+        t0 = time.perf_counter()
+        for k in range(repeat):
+            p_scan = scan_price(io.BytesIO(page))
+        t1 = time.perf_counter()
+        for k in range(repeat):
+            p_soup = soup_price(page)
+        t2 = time.perf_counter()
+        assert p_scan == p_soup, ('Extractors disagree on ' + fname + ': '
+                                  + str(p_scan) + ' != ' + str(p_soup))
+        results[fname] = ((t1 - t0) * 1000.0 / repeat,
+                          (t2 - t1) * 1000.0 / repeat, p_scan, p_soup)
+        print('%s: scan %.2f ms, soup %.2f ms (prices %s, %s)'
+              % ((fname,) + results[fname]))
+    return results
+
+
+# 4: constants
+yf_url = 'https://finance.yahoo.com/quote/'
+yf_json_url = 'https://query1.finance.yahoo.com/v7/finance/quote?symbols='
+# class of the span that holds the price on the quote page
+price_class = 'Fz(36px)'
+price_span = re.compile(rb'<span[^>]*\sclass="(?:[^"]*\s)?'
+                        + re.escape(price_class.encode())
+                        + rb'(?:\s[^"]*)?"[^>]*>\s*([^<]*?)\s*</span>')
+# size of the chunks read from the response, and the number of bytes kept
+# from the previous chunk so that a price span cut in two is still found
+chunk_size = 16384
+scan_overlap = 1024
@@ -0,0 +1,231 @@
+# Local store of historical prices for the trading account logbook
+#
+# Each ticker has its own folder in the store, containing one raw binary file
+# per column: dates as int64 days since 1970-01-01 and the open, high, low
+# and close prices as float64. The files are memory-mapped when read, so
+# analyses over many tickers neither re-parse CSV text nor copy the data.
+# Bars are kept sorted by date with at most one bar per date.
+# Columns of different lengths (after an interrupted write) make reading
+# fail and are truncated to the complete bars by the next append.
+
+
+# 0: packages
+import pandas as pd
+import numpy as np
+import os
+
+
+# 1: reading from the store
+def tickers(folder='./price_store'):
+    '''Return list of tickers in the price store.'''
+    if not os.path.isdir(folder):
+        return []
+    return sorted(t for t in os.listdir(folder)
+                  if os.path.isfile(column_file(t, 'date', folder)))
+
+
+def read_column(ticker, column='close', folder='./price_store'):
+    '''Return a read-only memory-mapped column of stored prices.
+
+    Arguments:
+    ticker -- ticker (e.g. the Yahoo Finance handle) of the stock
+
+    Optional arguments:
+    column -- 'date', 'open', 'high', 'low' or 'close' (default)
+    folder -- folder of the price store
+
+    Note:
+    Dates are returned as numpy datetime64[D] values. Raise
+    FileNotFoundError if there are no stored prices for the ticker, and
+    ValueError if the stored columns have different lengths (e.g. after an
+    interrupted append; the next append_bars repairs this).
+    '''
+    sizes = column_sizes(ticker, folder)
+    n = common_length(sizes)
+    for c in columns:
+        if sizes[c] != n * np.dtype(dtypes[c]).itemsize:
+            raise ValueError('Stored columns for ' + ticker + ' have '
+                             + 'different lengths; append bars to truncate '
+                             + 'them to the {:d} complete bars.'.format(n))
+    fname = column_file(ticker, column, folder)
+    if n == 0:
+        values = np.zeros(0, dtype=dtypes[column])
+    else:
+        values = np.memmap(fname, dtype=dtypes[column], mode='r')
+    if column == 'date':
+        values = values.view('datetime64[D]')
+    return values
+
+
+def read_prices(ticker, folder='./price_store'):
+    '''Return dataframe of stored prices with dates as index.
+
+    Arguments:
+    ticker -- ticker (e.g. the Yahoo Finance handle) of the stock
+
+    Optional arguments:
+    folder -- folder of the price store
+    '''
+    d = {}
+    for c in columns[1:]:
+        d[c.capitalize()] = read_column(ticker, c, folder)
+    index = pd.DatetimeIndex(read_column(ticker, 'date', folder), name='Date')
+    return pd.DataFrame(d, index=index, copy=False)
+
+
+def store_quote(folder='./price_store'):
+    '''Return a quote source that gives the last stored close price that is
+    not NaN (cf. price_quotes; can be passed to get_update_dict, auto_update
+    and check_watchlist as source).
+
+    Optional arguments:
+    folder -- folder of the price store
+    '''
+    def quote(ticker):
+        try:
+            close = read_column(ticker, 'close', folder)
+        except FileNotFoundError:
+            return None
+        valid = np.flatnonzero(~np.isnan(close))
+        if len(valid) == 0:
+            return None
+        return float(close[valid[-1]])
+    return quote
+
+
+# 2: writing to the store
+def append_bars(ticker, bars, folder='./price_store'):
+    '''Add bars to the stored prices of a ticker.
+
+    Arguments:
+    ticker -- ticker (e.g. the Yahoo Finance handle) of the stock
+    bars -- dataframe or dictionary with a 'Date' column and any of the
+                    columns 'Open', 'High', 'Low', 'Close' (missing columns
+                    keep the stored values of bars with the same date and
+                    are stored as NaN otherwise)
+
+    Optional arguments:
+    folder -- folder of the price store
+
+    Note:
+    Bars with a date that is already stored replace the stored ones. If all
+    new bars are later than the stored ones, they are appended to the files;
+    otherwise the files are rewritten. Return the number of bars stored.
+    '''
+    new = {'date': np.asarray(pd.to_datetime(bars['Date']),
+                              dtype='datetime64[D]').view('int64')}
+    n = len(new['date'])
+    if n == 0:
+        return 0
+    missing = []
+    for c in columns[1:]:
+        if c.capitalize() in bars.keys():
+            new[c] = np.asarray(bars[c.capitalize()], dtype='float64')
+        else:
+            new[c] = np.full(n, np.nan)
+            missing.append(c)
+    new = unique_bars(new)
+    if os.path.isfile(column_file(ticker, 'date', folder)):
+        repair(ticker, folder)
+        old_dates = read_column(ticker, 'date', folder).view('int64')
+    else:
+        os.makedirs(os.path.join(folder, ticker), exist_ok=True)
+        old_dates = np.zeros(0, dtype='int64')
+    if len(old_dates) == 0 or new['date'][0] > old_dates[-1]:
+        for c in columns:
+            col_file = open(column_file(ticker, c, folder), 'ab')
+            new[c].tofile(col_file)
+            col_file.close()
+    else:
+        old = {}
+        for c in columns:
+            old[c] = np.array(read_column(ticker, c, folder))
+        old['date'] = old['date'].view('int64')
+        # fill columns that were not given from the stored bars
+        pos = np.minimum(np.searchsorted(old['date'], new['date']),
+                         len(old['date']) - 1)
+        found = old['date'][pos] == new['date']
+        for c in missing:
+            new[c][found] = old[c][pos[found]]
+        merged = {}
+        for c in columns:
+            merged[c] = np.concatenate([old[c], new[c]])
+        merged = unique_bars(merged)
+        # write all columns before replacing any of them
+        for c in columns:
+            merged[c].tofile(column_file(ticker, c, folder) + '.tmp')
+        for c in columns:
+            fname = column_file(ticker, c, folder)
+            os.replace(fname + '.tmp', fname)
+    return len(new['date'])
+
+
+def import_csv(ticker, file_name='data.csv', folder='./price_store'):
+    '''Add prices from a file downloaded from Yahoo Finance to the store.
+
+    Arguments:
+    ticker -- ticker (e.g. the Yahoo Finance handle) of the stock
+
+    Optional arguments:
+    file_name -- name of the csv file (default 'data.csv')
+    folder -- folder of the price store
+    '''
+    d = pd.read_csv(file_name)
+    d = d.dropna(how='any')
+    n = append_bars(ticker, d, folder)
+    print('Stored {:d} bars for '.format(n) + ticker + '.')
+
+
+def unique_bars(bars):
+    # sort by date and keep the last given bar for each date
+    dates = bars['date'][::-1]
+    _, idx = np.unique(dates, return_index=True)
+    idx = len(dates) - 1 - idx
+    return {c: bars[c][idx] for c in bars.keys()}
+
+
+def column_sizes(ticker, folder):
+    # size in bytes of each column file (missing files count as empty,
+    # except for the date file, which defines whether the ticker is stored)
+    sizes = {}
+    for c in columns:
+        fname = column_file(ticker, c, folder)
+        if c == 'date' or os.path.isfile(fname):
+            sizes[c] = os.path.getsize(fname)
+        else:
+            sizes[c] = 0
+    return sizes
+
+
+def common_length(sizes):
+    # number of complete bars, i.e. values that are present in all columns
+    return min(sizes[c] // np.dtype(dtypes[c]).itemsize for c in columns)
+
+
+def repair(ticker, folder):
+    # truncate the column files to the length they have in common, dropping
+    # the bars that were only partly written
+    sizes = column_sizes(ticker, folder)
+    n = common_length(sizes)
+    truncated = False
+    for c in columns:
+        size = n * np.dtype(dtypes[c]).itemsize
+        fname = column_file(ticker, c, folder)
+        if sizes[c] != size or not os.path.isfile(fname):
+            col_file = open(fname, 'ab')
+            col_file.truncate(size)
+            col_file.close()
+            truncated = truncated or sizes[c] != size
+    if truncated:
+        print('Truncated stored prices for ' + ticker
+              + ' to {:d} complete bars.'.format(n))
+
+
+def column_file(ticker, column, folder):
+    return os.path.join(folder, ticker, column + '.bin')
+
+
+# 3: constants
+columns = ['date', 'open', 'high', 'low', 'close']
+dtypes = {'date': 'int64', 'open': 'float64', 'high': 'float64',
+          'low': 'float64', 'close': 'float64'}
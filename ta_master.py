@@ -34,9 +34,8 @@ class ShareValue:
         else:
             d = (pd.Timestamp('now') - new_sh.pur_date).days
         if d > 0:
-            new_sh.rel_val = (math.log(
-                (new_sh.shr_val + new_sh.div_val - s_fee) / new_sh.pur_pr)
-                * 365.0 / float(d))
+            new_sh.rel_val = float(rel_value_array(
+                new_sh.shr_val, new_sh.div_val, new_sh.pur_pr, d, s_fee))
         return new_sh
 
     def value(self, **kwarg):
@@ -140,30 +139,44 @@ def update(**values):
     Note:
     Running this method without any arguments leaves the share values
         invariant and updates the time-dependent relative values only.
+    Nothing is logged (ValueError) if a share value plus dividends is not
+        above the sales fee.
     '''
     if 'date' in values.keys():
         now = values['date']
     else:
         now = pd.Timestamp('now')
-    shares = active_shares()
     ta = ta_read()
     ind = ta.index[-1] + 1
     ta = ta.append(ta.loc[ind - 1], ignore_index=True)
     ta.loc[ind, 'Date'] = now
     ta.loc[ind, 'Comment'] = 'Update'
-    for s in shares:
-        if (now-ta.loc[ind, s].pur_date).days > 0:
+    shares = [s for s in active_shares()
+              if (now - ta.loc[ind, s].pur_date).days > 0]
+    if shares:
+        svs = [copy.copy(ta.loc[ind, s]) for s in shares]
+        for s, sv in zip(shares, svs):
             if s in values.keys():
-                curr_val = values[s]
-            else:
-                curr_val = ta.loc[ind, s].shr_val
-            ta.loc[ind, s] = ta.loc[ind, s].update_sv(value=curr_val, date=now)
+                sv.shr_val = values[s]
+        rel = rel_value_array(
+            np.array([sv.shr_val for sv in svs], dtype=float),
+            np.array([sv.div_val for sv in svs], dtype=float),
+            np.array([sv.pur_pr for sv in svs], dtype=float),
+            np.array([(now - sv.pur_date).days for sv in svs], dtype=float),
+            s_fee)
+        for s, sv, r in zip(shares, svs, rel):
+            sv.rel_val = float(r)
+            ta.loc[ind, s] = sv
     ta_write(ta)
 
 
-def auto_update():
-    '''Scrape the value of the portfolio and update.'''
-    ud = get_update_dict()
+def auto_update(**kwargs):
+    '''Scrape the value of the portfolio and update.
+
+    Keyword arguments:
+    source -- quote source passed on to get_update_dict
+    '''
+    ud = get_update_dict(**kwargs)
     update(**ud)
 
 
@@ -237,6 +250,79 @@ def sell(name, amount, **kwargs):
         print(name + ' was sold with an overall return of {:.1f}%.'.format(r))
 
 
+def recompute_relative_values(**kwargs):
+    '''Back up trading account dataframe and then recompute the relative
+    values of all shares in all rows.
+
+    Keyword arguments:
+    fee -- sales fee used for the relative values, default is s_fee
+    start -- only recompute rows from this date on, default is all rows
+            (e.g.: start = pd.Timestamp(2017,1,1))
+
+    Note:
+    Use this after changing s_fee or after correcting share values by hand.
+    As when the rows were logged, a relative value is computed in the row in
+    which a share value was updated (updates and dividends) and carried over
+    unchanged to the following rows until the next update. Rows in which a
+    share is not held, or in which it was bought on the same day, are left
+    unchanged. Nothing is changed if a share value plus dividends is not
+    above the fee.
+    '''
+    if 'fee' in kwargs.keys():
+        fee = kwargs['fee']
+    else:
+        fee = s_fee
+    backup()
+    ta = ta_read()
+    shares = list_shares(mode='all', ta=ta)
+    if shares:
+        cells = ta.loc[:, shares].values
+        # cells that hold a share value object not present in the row above
+        new = np.ones(cells.shape, dtype=bool)
+        new[1:] = np.vectorize(lambda a, b: a is not b,
+                               otypes=[bool])(cells[1:], cells[:-1])
+        if 'start' in kwargs.keys():
+            new &= (ta['Date'] >= kwargs['start']).values[:, None]
+        attr = np.vectorize(lambda sv, a: getattr(sv, a), otypes=[object])
+        shr = attr(cells, 'shr_val').astype(float)
+        div = attr(cells, 'div_val').astype(float)
+        pur_pr = attr(cells, 'pur_pr').astype(float)
+        pur_date = attr(cells, 'pur_date').astype('datetime64[ns]')
+        old_rel = attr(cells, 'rel_val').astype(float)
+        dates = ta['Date'].values.astype('datetime64[ns]')
+        days = ((dates[:, None] - pur_date).astype('timedelta64[D]')
+                .astype(float))
+        todo = new & (shr != 0) & (days > 0)
+        rel = old_rel.copy()
+        rel[todo] = rel_value_array(shr[todo], div[todo], pur_pr[todo],
+                                    days[todo], fee)
+        changed = todo & ~np.isclose(rel, old_rel, rtol=1e-12, atol=0.0,
+                                     equal_nan=True)
+        out = cells.copy()
+        for i, j in zip(*np.nonzero(changed)):
+            sv = copy.copy(cells[i, j])
+            sv.rel_val = float(rel[i, j])
+            k = i
+            while k < cells.shape[0] and cells[k, j] is cells[i, j]:
+                out[k, j] = sv
+                k = k + 1
+        for j in range(len(shares)):
+            ta[shares[j]] = pd.Series(out[:, j], index=ta.index, dtype=object)
+    ta_write(ta)
+    print('Backed up trading account and recomputed relative values.')
+
+
+def rel_value_array(shr_val, div_val, pur_pr, days, fee):
+    # relative values as in ShareValue.update_sv, for arrays of shares
+    ratio = ((np.asarray(shr_val, dtype=float)
+              + np.asarray(div_val, dtype=float) - fee)
+             / np.asarray(pur_pr, dtype=float))
+    if np.any(ratio <= 0):
+        raise ValueError('Share value plus dividends has to be above the '
+                         + 'fee, relative value not defined.')
+    return np.log(ratio) * 365.0 / np.asarray(days, dtype=float)
+
+
 # 3: methods that return a displayable dataframe
 def rel_values(**kwargs):
     '''Return dataframe with relative values as floats.
@@ -327,18 +413,128 @@ def shr_values(**kwargs):
     return temp
 
 
+def iter_values(**kwargs):
+    '''Iterate over the rows of the trading account, one row at a time.
+
+    Keyword arguments:
+    all_shares -- display all shares instead of
+                                    active ones only (default False)
+    comments -- display comments (default True)
+    acct_bal -- display account balance (default True)
+    date_as_string -- write dates as strings (default False)
+    mode -- default is 'rel', set to 'shr', 'eff', 'div' or 'all' to
+                                    display other types of value
+
+    Note:
+    Each row is yielded as a dictionary with the column names as keys. Only
+    the row that is yielded is converted, so, unlike rel_values() and
+    all_values(), no converted copy of the whole dataframe is built.
+    '''
+    display_args = {'all_shares': False,
+                    'comments': True,
+                    'acct_bal': True,
+                    'date_as_string': False,
+                    'mode': 'rel'}
+    for k in kwargs.keys():
+        if k in display_args.keys():
+            display_args[k] = kwargs[k]
+    return convert_rows(display_args)
+
+
+def iter_pages(page_size=100, **kwargs):
+    '''Iterate over the trading account in dataframes of a fixed length.
+
+    Optional arguments:
+    page_size -- number of rows per dataframe (the last one may be shorter)
+
+    Keyword arguments:
+    Same as for iter_values(); in addition,
+    date_as_index -- set dates as index (default False)
+
+    Note:
+    The page size has to be a positive integer, otherwise no pages are
+    returned.
+    '''
+    if (not isinstance(page_size, int) or isinstance(page_size, bool)
+            or page_size <= 0):
+        print('Page size has to be a positive integer, no action taken.')
+        return iter(())
+    return make_pages(page_size, kwargs)
+
+
+def make_pages(page_size, kwargs):
+    page = []
+    for row in iter_values(**kwargs):
+        page.append(row)
+        if len(page) == page_size:
+            yield make_page(page, kwargs)
+            page = []
+    if page:
+        yield make_page(page, kwargs)
+
+
+def export_values(file_name, **kwargs):
+    '''Write the trading account to a file, one row at a time.
+
+    Arguments:
+    file_name -- name of the file; rows are written as CSV unless the name
+                    ends with '.jsonl', in which case they are written as
+                    JSON lines
+
+    Keyword arguments:
+    Same as for iter_values(), but all_shares defaults to True.
+
+    Note:
+    Dates are written in ISO format and missing relative values as empty
+    fields (CSV) or null (JSON lines).
+    '''
+    import csv
+    import json
+    if 'all_shares' not in kwargs.keys():
+        kwargs['all_shares'] = True
+    out_file = open(file_name, 'w', newline='')
+    writer = None
+    for row in iter_values(**kwargs):
+        for k in row.keys():
+            v = row[k]
+            if isinstance(v, pd.Timestamp):
+                row[k] = v.isoformat()
+            elif isinstance(v, float) and math.isnan(v):
+                row[k] = None
+        if file_name.endswith('.jsonl'):
+            out_file.write(json.dumps(row, default=str) + '\n')
+        else:
+            if writer is None:
+                writer = csv.DictWriter(out_file, fieldnames=list(row.keys()))
+                writer.writeheader()
+            writer.writerow(row)
+    out_file.close()
+
+
+def make_page(rows, kwargs):
+    page = pd.DataFrame(rows, columns=list(rows[0].keys()))
+    if 'date_as_index' in kwargs.keys() and kwargs['date_as_index']:
+        page = page.set_index('Date')
+    return page
+
+
+def convert_rows(display_args):
+    ta = ta_read()
+    shares, cols = display_columns(display_args, ta)
+    fixed = cols[:len(cols) - len(shares)]
+    columns = [iter(ta[c]) for c in cols]
+    for row in zip(*columns):
+        d = dict(zip(fixed, row))
+        if display_args['date_as_string']:
+            d['Date'] = d['Date'].strftime("%y-%m-%d")
+        for s, sv in zip(shares, row[len(fixed):]):
+            d[s] = sv.value(mode=display_args['mode'])
+        yield d
+
+
 def convert_df(display_args):
-    if display_args['all_shares']:
-        shares = all_shares()
-    else:
-        shares = active_shares()
-    cols = shares
-    if display_args['comments']:
-        cols = ['Comment'] + cols
-    if display_args['acct_bal']:
-            cols = ['Acct Bal'] + cols
-    cols = ['Date'] + cols
     ta = ta_read()
+    shares, cols = display_columns(display_args, ta)
     for s in shares:
         for j in range(ta.shape[0]):
             ta.loc[j, s] = ta.loc[j, s].value(mode=display_args['mode'])
@@ -348,6 +544,20 @@ def convert_df(display_args):
     return ta.reindex(columns=cols)
 
 
+def display_columns(display_args, ta):
+    if display_args['all_shares']:
+        shares = list_shares(mode='all', ta=ta)
+    else:
+        shares = list_shares(ta=ta)
+    cols = shares
+    if display_args['comments']:
+        cols = ['Comment'] + cols
+    if display_args['acct_bal']:
+            cols = ['Acct Bal'] + cols
+    cols = ['Date'] + cols
+    return shares, cols
+
+
 # 4: other methods on the data frame
 def all_shares():
     '''Return list of all shares.'''
@@ -360,7 +570,10 @@ def active_shares():
 
 
 def list_shares(**kwarg):
-    ta = ta_read()
+    if 'ta' in kwarg.keys():
+        ta = kwarg['ta']
+    else:
+        ta = ta_read()
     shares = list(ta.columns)
     shares.remove('Date')
     shares.remove('Acct Bal')
@@ -588,17 +801,184 @@ def simulate_p(mu, sigma, begweek=12, endweek=52, **kwargs):
     return df
 
 
-def find_mu_sigma(data=[]):
+def simulate_portfolio(begweek=12, endweek=52, **kwargs):
+    '''Simulate the joint evolution of all active shares with correlated
+    weekly growth rates estimated from historical prices. Produces a table
+    that indicates how likely it is that certain relative values will be
+    achieved within a specified period, for the whole portfolio and for each
+    share. The week in which each relative value was achieved is given in the
+    row below it.
+
+    Optional arguments:
+    begweek -- first week of period in which shares may be sold
+    endweek -- last week of period in which shares may be sold
+
+    Keyword arguments:
+    tickers -- dictionary with share names as keys and the tickers in the
+                price store as values (default: taken from the stock
+                dictionary <account name>_dict.txt, cf. get_update_dict)
+    mu -- vector of mean weekly growth rates (in the order of active_shares)
+    cov -- covariance matrix of weekly growth rates (mu and cov have to be
+                given together; if they are not given, they are found
+                using find_mu_cov)
+    folder -- folder of the price store (default './price_store')
+    N -- number of simulated paths (default 10000)
+    chunk -- number of paths simulated at once (default 1000)
+    workers -- number of chunks simulated in parallel (default: cpu count)
+    seed -- seed of the random number generator
+
+    Note:
+    Relative values start from the current share values, dividends, purchase
+    prices and dates in the trading account and are computed as in the
+    trading account (taking into account the sales fee). For the portfolio,
+    the holding period is the average of those of the shares, weighted by
+    the purchase prices.
+    '''
+    from concurrent.futures import ThreadPoolExecutor
+    opts = {'folder': './price_store', 'N': 10000, 'chunk': 1000,
+            'workers': os.cpu_count(), 'seed': None}
+    for k in kwargs.keys():
+        if k in opts.keys():
+            opts[k] = kwargs[k]
+    if not (1 <= begweek <= endweek):
+        print('Weeks have to satisfy 1 <= begweek <= endweek.'
+              + ' No simulation run.')
+        return None
+    if opts['N'] < 1 or opts['chunk'] < 1:
+        print('N and chunk have to be positive. No simulation run.')
+        return None
+    if ('mu' in kwargs.keys()) != ('cov' in kwargs.keys()):
+        print('Either both or none of mu and cov have to be given.'
+              + ' No simulation run.')
+        return None
+    shares = active_shares()
+    if not shares:
+        print('No active shares. No simulation run.')
+        return None
+    if 'mu' in kwargs.keys():
+        mu = np.asarray(kwargs['mu'], dtype=float)
+        cov = np.atleast_2d(np.asarray(kwargs['cov'], dtype=float))
+        S = len(shares)
+        if mu.shape != (S,) or cov.shape != (S, S):
+            print('mu and cov have to match the {:d} active shares'.format(S)
+                  + ' (' + ', '.join(shares) + '). No simulation run.')
+            return None
+    else:
+        if 'tickers' in kwargs.keys():
+            tickers = kwargs['tickers']
+        else:
+            stock_dict = read_stock_dict()
+            tickers = {s: stock_dict[s][0] for s in stock_dict.keys()}
+        missing = [s for s in shares if s not in tickers.keys()]
+        if missing:
+            print('No tickers given for ' + ', '.join(missing)
+                  + '. No simulation run.')
+            return None
+        import price_store
+        stored = price_store.tickers(opts['folder'])
+        missing = [tickers[s] for s in shares if tickers[s] not in stored]
+        if missing:
+            print('No stored prices for ' + ', '.join(missing)
+                  + ' (cf. price_store.import_csv). No simulation run.')
+            return None
+        try:
+            mu, cov = find_mu_cov([tickers[s] for s in shares],
+                                  opts['folder'])
+        except FileNotFoundError:
+            print('Stored prices incomplete for some of '
+                  + ', '.join(tickers[s] for s in shares)
+                  + '. No simulation run.')
+            return None
+    if not (np.all(np.isfinite(mu)) and np.all(np.isfinite(cov))):
+        print('mu and cov have to be finite (at least two weekly returns'
+              + ' with common dates are needed). No simulation run.')
+        return None
+    now = pd.Timestamp('now')
+    ta = ta_read()
+    last = ta.loc[ta.index[-1]]
+    v0 = np.array([last[s].shr_val for s in shares], dtype=float)
+    div = np.array([last[s].div_val for s in shares], dtype=float)
+    cost = np.array([last[s].pur_pr for s in shares], dtype=float)
+    days0 = np.array([(now - last[s].pur_date).days for s in shares],
+                     dtype=float)
+    # small jitter so that the decomposition works for singular matrices
+    try:
+        chol = np.linalg.cholesky(cov + 1e-12 * np.eye(len(shares)))
+    except np.linalg.LinAlgError:
+        print('cov is not a positive semi-definite matrix.'
+              + ' No simulation run.')
+        return None
+    b = begweek - 1
+    sizes = [opts['chunk']] * (opts['N'] // opts['chunk'])
+    if opts['N'] % opts['chunk']:
+        sizes.append(opts['N'] % opts['chunk'])
+    seeds = np.random.SeedSequence(opts['seed']).spawn(len(sizes))
+    with ThreadPoolExecutor(max_workers=opts['workers']) as ex:
+        results = list(ex.map(
+            lambda a: simulate_chunk(a[0], a[1], mu, chol, v0, div, cost,
+                                     days0, b, endweek),
+            zip(seeds, sizes)))
+    maxima = np.concatenate([r[0] for r in results])
+    weeks = np.concatenate([r[1] for r in results])
+    names = ['Portfolio'] + shares
+    cols = ['p_max', 'p_90', 'p_80', 'p_70', 'p_60', 'p_50', 'p_40',
+            'p_30', 'p_20', 'p_10', 'p_min']
+    N = maxima.shape[0]
+    ranks = [N-1] + [int(((9-k)*N)/10) for k in range(9)] + [0]
+    index = pd.MultiIndex.from_product([names, ['p', 'week']])
+    df = pd.DataFrame('', index=index, columns=cols)
+    for j in range(len(names)):
+        order = np.argsort(maxima[:, j])[ranks]
+        df.loc[(names[j], 'p'), :] = [
+            '{:.4f}'.format(val) for val in maxima[order, j]]
+        df.loc[(names[j], 'week'), :] = [
+            '{:d}'.format(int(w)) for w in weeks[order, j]]
+    return df
+
+
+def simulate_chunk(seed, size, mu, chol, v0, div, cost, days0, b, n):
+    # maximal relative values (portfolio first, then each share) in weeks
+    # b+1 to n for a chunk of paths, and the weeks in which they are reached
+    rng = np.random.default_rng(seed)
+    z = rng.standard_normal((size, n, len(mu)))
+    growth = np.cumsum(mu + z @ chol.T, axis=1)
+    vals = v0 * np.exp(growth[:, b:, :]) + div - s_fee
+    days = days0 + 7.0 * np.arange(b+1, n+1)[:, None]
+    p = np.empty((size, n-b, len(mu)+1))
+    p[:, :, 1:] = np.log(np.maximum(vals, 1e-12) / cost) * 365.0 / days
+    port_days = (days * cost).sum(axis=1) / cost.sum()
+    p[:, :, 0] = (np.log(np.maximum(vals.sum(axis=2), 1e-12) / cost.sum())
+                  * 365.0 / port_days)
+    return p.max(axis=1), p.argmax(axis=1) + b + 1
+
+
+def find_mu_sigma(data=[], **kwargs):
     '''Find mean logreturn and its standard deviation from a data column of
-    weekly share prices. This data can be passed as an argument or must be
-    saved in a file called 'data.csv' in the working directory (downloaded
-    from Yahoo Finance).
+    weekly share prices. This data can be passed as an argument, read from the
+    price store, or must be saved in a file called 'data.csv' in the working
+    directory (downloaded from Yahoo Finance).
 
     Optional arguments:
     data -- list of weekly stock prices
+
+    Keyword arguments:
+    ticker -- read the close prices of this ticker from the price store
+                (cf. price_store; use import_csv to add a downloaded file)
+    folder -- folder of the price store (default './price_store')
     '''
-    if data:
+    if len(data) > 0:
         v = data
+    elif 'ticker' in kwargs.keys():
+        import price_store
+        if 'folder' in kwargs.keys():
+            folder = kwargs['folder']
+        else:
+            folder = './price_store'
+        try:
+            v = price_store.read_column(kwargs['ticker'], 'close', folder)
+        except FileNotFoundError:
+            print('No stored prices for ' + kwargs['ticker'] + ', return NaN.')
+            return [np.nan, np.nan]
     else:
         try:
             d = pd.read_csv('data.csv')
@@ -607,50 +987,101 @@ def find_mu_sigma(data=[]):
             return [np.nan, np.nan]
         else:
             d = d.dropna(how='any')
-            d = d.reset_index()
-            v = d.Close
-    log_returns = []
-    for k in range(1, len(v)):
-        log_returns.append(math.log(float(v[k])/float(v[k-1])))
-    log_returns = np.asarray(log_returns)
+            v = d.Close.values
+    v = np.asarray(v, dtype=float)
+    log_returns = np.diff(np.log(v[~np.isnan(v)]))
     mu = log_returns.mean()
     sigma = log_returns.std()
     return [mu, sigma]
 
 
-def check_watchlist():
-    '''Check whether stocks in watchlist are below given values.'''
+def find_mu_cov(tickers, folder='./price_store'):
+    '''Find mean logreturns and their covariance matrix from the weekly close
+    prices of several stocks saved in the price store (cf. price_store).
+
+    Arguments:
+    tickers -- list of tickers (Yahoo Finance handles)
+
+    Optional arguments:
+    folder -- folder of the price store
+
+    Note:
+    Only dates for which prices of all given stocks are stored are used.
+    Return [mu, cov], a vector of means and the covariance matrix (NaN if
+    there are fewer than two weekly returns with common dates).
+    '''
+    import price_store
+    closes = []
+    for t in tickers:
+        closes.append(pd.Series(
+            price_store.read_column(t, 'close', folder),
+            index=price_store.read_column(t, 'date', folder), name=t))
+    prices = pd.concat(closes, axis=1, join='inner').dropna(how='any')
+    if prices.shape[0] < 3:
+        print('Fewer than two weekly returns with common dates, return NaN.')
+        n = len(tickers)
+        return [np.full(n, np.nan), np.full((n, n), np.nan)]
+    log_returns = np.diff(np.log(prices.values), axis=0)
+    mu = log_returns.mean(axis=0)
+    cov = np.atleast_2d(np.cov(log_returns, rowvar=False, bias=True))
+    return [mu, cov]
+
+
+def check_watchlist(**kwargs):
+    '''Check whether stocks in watchlist are below given values.
+
+    Keyword arguments:
+    source -- quote source, i.e. function that returns the current price for
+                a Yahoo Finance handle (default yahoo_quote, cf. price_quotes)
+    '''
     cwl = open('./cwl.py')
-    exec(cwl.read())
+    env = {}
+    if 'source' in kwargs.keys():
+        env['quote_source'] = kwargs['source']
+    exec(cwl.read(), env)
     cwl.close()
 
 
-def get_update_dict():
-    '''Get a dictionary of current values in the portfolio.'''
-    import urllib.request
-    from bs4 import BeautifulSoup
-    dict_file_name = account_name()[0] + '_dict.txt'
+def get_update_dict(**kwargs):
+    '''Get a dictionary of current values in the portfolio.
+
+    Keyword arguments:
+    source -- quote source, i.e. function that returns the current price for
+                a Yahoo Finance handle (default yahoo_quote, cf. price_quotes)
+    '''
+    from price_quotes import yahoo_quote
+    if 'source' in kwargs.keys():
+        quote_source = kwargs['source']
+    else:
+        quote_source = yahoo_quote
     update_dict = {}
+    stock_dict = read_stock_dict()
+    for TA_name in stock_dict.keys():
+        YF_name, n_stock = stock_dict[TA_name]
+        curr_pr = quote_source(YF_name)
+        if curr_pr is None:
+            print('No price found for ' + YF_name + ', '
+                  + TA_name + ' not included.')
+        else:
+            update_dict[TA_name] = n_stock * curr_pr
+    return update_dict
+
+
+def read_stock_dict():
+    # map share names to [Yahoo Finance handle, number of stock]
+    dict_file_name = account_name()[0] + '_dict.txt'
+    stock_dict = {}
     if os.path.isfile(dict_file_name):
         stock_dict_file = open(dict_file_name, 'r')
         for line in stock_dict_file:
             if line.strip():
                 temp_list = line.strip().split(' ')
-                TA_name = temp_list[0]
-                YF_name = temp_list[1]
-                n_stock = int(temp_list[2])
-                source = "https://finance.yahoo.com/quote/"+YF_name
-                filehandle = urllib.request.urlopen(source)
-                soup = BeautifulSoup(filehandle.read(), "html.parser")
-                priceSpan = soup.findAll("span", {"class": "Fz(36px)"})
-                for elt in priceSpan:
-                    curr_pr = float(elt.getText())
-                update_dict[TA_name] = n_stock * curr_pr
+                stock_dict[temp_list[0]] = [temp_list[1], int(temp_list[2])]
         stock_dict_file.close()
     else:
         print('File containing dictionary of stocks in the portfolio')
         print('not found. Should be called <' + dict_file_name + '>.')
-    return update_dict
+    return stock_dict
 
 
 # 6: constants